@@ -2,8 +2,12 @@
 Configuration settings for the auction system.
 """
 
+from functools import lru_cache
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
+from sqlalchemy.engine import make_url
 
 
 class Settings(BaseSettings):
@@ -11,6 +15,12 @@ class Settings(BaseSettings):
 
     # Database settings
     database_url: str = Field(..., env="DATABASE_URL")
+    async_database_url: Optional[str] = Field(default=None, env="ASYNC_DATABASE_URL")
+    db_pool_size: int = Field(default=10, env="DB_POOL_SIZE")
+    db_pool_overflow: int = Field(default=20, env="DB_POOL_OVERFLOW")
+    db_pool_timeout: int = Field(default=30, env="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=1800, env="DB_POOL_RECYCLE")
+    db_query_cache_size: int = Field(default=1200, env="DB_QUERY_CACHE_SIZE")
 
     # Redis settings
     redis_url: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
@@ -24,8 +34,14 @@ class Settings(BaseSettings):
         extra = "ignore"  # Ignore extra fields in .env
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the application settings, parsing the environment only once."""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
 
 
 def get_database_url() -> str:
@@ -33,6 +49,22 @@ def get_database_url() -> str:
     return settings.database_url
 
 
+def get_async_database_url() -> str:
+    """Get the async (asyncpg) database URL, derived from DATABASE_URL unless set."""
+    if settings.async_database_url:
+        return settings.async_database_url
+
+    url = make_url(settings.database_url)
+    if url.get_backend_name() == "postgresql":
+        query = dict(url.query)
+        # asyncpg spells sslmode as ssl and has no channel_binding option
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        query.pop("channel_binding", None)
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+    return url.render_as_string(hide_password=False)
+
+
 def get_redis_url() -> str:
     """Get Redis URL."""
     return settings.redis_url
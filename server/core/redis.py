@@ -0,0 +1,60 @@
+"""
+Shared Redis connection pools for the auction system.
+"""
+
+import anyio
+import redis.asyncio as aioredis
+
+from core.config import get_redis_url
+
+# One pool per process: request handlers borrow a connection instead of
+# opening (and authenticating) a new one on every call. Replies are decoded
+# to str by the parser (hiredis when installed), not in handler code.
+redis_pool = aioredis.ConnectionPool.from_url(
+    get_redis_url(),
+    max_connections=20,
+    socket_timeout=2,
+    socket_connect_timeout=1,
+    decode_responses=True,
+)
+
+# Pub/sub subscribers hold a connection for as long as they listen, so they
+# draw from a larger pool of their own without the read timeout.
+pubsub_pool = aioredis.ConnectionPool.from_url(
+    get_redis_url(), max_connections=1000, decode_responses=True
+)
+
+# Stories never change once generated, so a cached one only ages out to
+# free memory
+STORY_CACHE_TTL = 7 * 24 * 60 * 60
+
+
+def get_redis() -> aioredis.Redis:
+    """Get a Redis client backed by the shared connection pool."""
+    return aioredis.Redis(connection_pool=redis_pool)
+
+
+def get_pubsub() -> aioredis.client.PubSub:
+    """Get a pub/sub handle backed by the subscriber pool."""
+    return aioredis.Redis(connection_pool=pubsub_pool).pubsub(ignore_subscribe_messages=True)
+
+
+async def close_pubsub(pubsub: aioredis.client.PubSub) -> None:
+    """Release a pub/sub handle's connection, even from a cancelled task.
+
+    Closing drops the connection, and its subscriptions with it. A client
+    going away cancels the task that streams to it, which would otherwise
+    abort the cleanup at its first await and leak the connection.
+    """
+    with anyio.CancelScope(shield=True):
+        await pubsub.aclose()
+
+
+def job_channel(job_id: str) -> str:
+    """Get the channel a story job's status transitions are published on."""
+    return f"job:{job_id}"
+
+
+def story_cache_key(story_id: int) -> str:
+    """Get the key a completed story's serialized response is cached under."""
+    return f"story:complete:{story_id}"
@@ -1,3 +1,7 @@
+from functools import lru_cache
+from typing import List, Tuple
+
+import httpx
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
@@ -12,14 +16,39 @@ from models.story import Story, StoryNode
 
 load_dotenv()
 
+
+@lru_cache(maxsize=1)
+def get_llm_client() -> httpx.Client:
+    """Get the process-wide HTTP client, so generations reuse open connections."""
+    # Created on first use, i.e. inside each worker process, never across a fork
+    return httpx.Client(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=httpx.Timeout(600.0, connect=5.0),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_llm() -> ChatOpenAI:
+    """Get the process-wide chat model, built on the shared HTTP client."""
+    return ChatOpenAI(model="gpt-4o-mini", http_client=get_llm_client())
+
+
+def close_llm_client() -> None:
+    """Close the shared HTTP client, if this process ever opened it."""
+    if get_llm_client.cache_info().currsize:
+        get_llm_client().close()
+        get_llm_client.cache_clear()
+        get_llm.cache_clear()
+
+
 class StoryGenerator():
 
     @classmethod
     def _get_llm(cls):
-        return ChatOpenAI(model="gpt-4o-mini")
+        return get_llm()
 
     @classmethod
-    def generate_story(cls, db: Session, session_id: str, theme: str = 'comedy') -> Story:
+    def generate_story_payload(cls, theme: str = 'comedy') -> StoryLLMResponse:
         llm = cls._get_llm()
         story_parser = PydanticOutputParser(pydantic_object=StoryLLMResponse)
 
@@ -34,57 +63,60 @@ class StoryGenerator():
         if hasattr(raw_response, "content"):
             response_text = raw_response.content
 
-        story_structure = story_parser.parse(response_text)
+        return story_parser.parse(response_text)
+
+    @classmethod
+    def save_story(cls, db: Session, session_id: str, story_structure: StoryLLMResponse) -> Story:
+        nodes: List[StoryNode] = []
+        option_links: List[List[Tuple[str, int]]] = []
+        cls._collect_story_nodes(story_structure.rootNode, nodes, option_links, is_root=True)
 
         story_db = Story(
             title=story_structure.title,
             session_id=session_id,
+            nodes=nodes,
         )
 
+        # The story row, then every node in one batched INSERT ... RETURNING
         db.add(story_db)
         db.flush()
 
-        root_node_data = story_structure.rootNode
-
-        if isinstance(root_node_data, dict):
-            root_node_data = StoryNodeLLM.model_validate(root_node_data)
-
-        cls._process_story_node(db, story_db.id, root_node_data, is_root=True)
+        # Options point at node ids, which only exist now; one batched UPDATE
+        for node, links in zip(nodes, option_links):
+            if links:
+                node.options = [
+                    {"text": text, "next_node_id": nodes[index].id} for text, index in links
+                ]
+        db.flush()
 
-        db.commit()
         return story_db
 
     @classmethod
-    def _process_story_node(cls, db: Session, story_id: int, node_data: StoryNodeLLM, is_root: bool = False) -> StoryNode:
-        node = StoryNode(
-            story_id=story_id,
-            content=node_data.content if hasattr(node_data, "content") else node_data["content"],
+    def _collect_story_nodes(
+        cls,
+        node_data: StoryNodeLLM,
+        nodes: List[StoryNode],
+        option_links: List[List[Tuple[str, int]]],
+        is_root: bool = False,
+    ) -> int:
+        """Append the node and its subtree in pre-order, returning the node's index."""
+        if isinstance(node_data, dict):
+            node_data = StoryNodeLLM.model_validate(node_data)
+
+        index = len(nodes)
+        nodes.append(StoryNode(
+            content=node_data.content,
             is_root=is_root,
-            is_ending=node_data.isEnding if hasattr(node_data, "isEnding") else node_data["isEnding"],
-            is_winning_ending=node_data.isWinningEnding if hasattr(node_data, "isWinningEnding") else node_data["isWinningEnding"],
+            is_ending=node_data.isEnding,
+            is_winning_ending=node_data.isWinningEnding,
             options=[],
-        )
-
-        db.add(node)
-        db.flush()
-
-        if not node.is_ending and node_data.options:
-            option_list = []
+        ))
+        links: List[Tuple[str, int]] = []
+        option_links.append(links)
 
+        if not node_data.isEnding and node_data.options:
             for option_data in node_data.options:
-                next_node = option_data.nextNode
+                child_index = cls._collect_story_nodes(option_data.nextNode, nodes, option_links)
+                links.append((option_data.text, child_index))
 
-                if isinstance(next_node, dict):
-                    next_node = StoryNodeLLM.model_validate(next_node)
-
-                child_node = cls._process_story_node(db, story_id, next_node, False)
-
-                option_list.append({
-                    "text": option_data.text,
-                    "next_node_id": child_node.id,
-                })
-
-            node.options = option_list
-
-        db.flush()
-        return node
+        return index
@@ -0,0 +1,97 @@
+"""
+Celery worker and background tasks for the auction system.
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+import redis
+from celery import Celery
+from celery.signals import worker_process_shutdown
+
+from core.config import get_redis_url
+from core.redis import STORY_CACHE_TTL, job_channel, story_cache_key
+from core.story_generator import StoryGenerator, close_llm_client
+from db.database import session_scope
+from models.job import StoryJob
+from models.story import Story
+from schemas.job import StoryJobStatusEvent
+from schemas.story import build_complete_story
+
+logger = logging.getLogger(__name__)
+
+# Story generation waits on the LLM for seconds to minutes, so it runs in
+# dedicated worker processes instead of the API's event loop or threadpool:
+#   celery -A core.tasks worker -Q story_gen --concurrency=4
+celery_app = Celery("agent0", broker=get_redis_url(), backend=get_redis_url())
+celery_app.conf.update(
+    task_routes={"core.tasks.generate_story_task": {"queue": "story_gen"}},
+    # Requeue a job if its worker dies mid-generation rather than losing it
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+)
+
+
+@worker_process_shutdown.connect
+def release_llm_client(**kwargs) -> None:
+    close_llm_client()
+
+
+# Workers are synchronous processes, so they publish with a blocking client
+redis_client = redis.Redis.from_url(get_redis_url())
+
+
+def publish_job_status(job: StoryJob, story: Optional[Story] = None) -> None:
+    """Announce a committed job status transition to anyone streaming the job.
+
+    A finished story is cached in the same round trip, so its first read
+    skips the database.
+    """
+    event = StoryJobStatusEvent.model_validate(job)
+    complete_story = build_complete_story(story) if story is not None else None
+
+    # Best effort: the job row is the source of truth, so a Redis failure must
+    # not abort the task and strand the job mid-transition
+    try:
+        with redis_client.pipeline(transaction=False) as pipe:
+            if complete_story is not None:
+                pipe.set(story_cache_key(story.id), complete_story.model_dump_json(), ex=STORY_CACHE_TTL)
+            pipe.publish(job_channel(job.job_id), event.model_dump_json())
+            pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Publishing status %s for job %s failed: %s", job.status, job.job_id, e)
+
+
+# The StoryJob row is the job's result, so nothing is written to the backend
+@celery_app.task(ignore_result=True)
+def generate_story_task(job_id: str, theme: str, session_id: str):
+    with session_scope() as db:
+        job = db.query(StoryJob).filter(StoryJob.job_id == job_id).first()
+
+        if not job:
+            return
+
+        job.status = "processing"
+        db.commit()
+        publish_job_status(job)
+
+        try:
+            # Nothing is written while waiting on the LLM
+            story_structure = StoryGenerator.generate_story_payload(theme)
+            story = StoryGenerator.save_story(db, session_id, story_structure)
+        except Exception as e:
+            # Discard the partly generated story, then record the failure
+            db.rollback()
+            job.error = str(e)
+            job.status = "failed"
+            job.completed_at = datetime.now()
+            db.commit()
+            publish_job_status(job)
+            raise
+
+        job.story_id = story.id
+        job.status = "completed"
+        job.completed_at = datetime.now()
+        db.commit()
+        publish_job_status(job, story)
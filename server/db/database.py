@@ -2,27 +2,63 @@
 Database connection and session management for the auction system.
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 
-from core.config import get_database_url
+from core.config import get_async_database_url, get_database_url, settings
 from models.auction import Base
 
-# Create engine
-engine = create_engine(get_database_url())
+# Create engine with a bounded, self-healing connection pool
+engine = create_engine(
+    get_database_url(),
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_pool_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=True,
+    query_cache_size=settings.db_query_cache_size,
+)
+
+# Async engine (asyncpg) for code running on the event loop, such as GraphQL resolvers
+async_engine = create_async_engine(
+    get_async_database_url(),
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_pool_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=True,
+    query_cache_size=settings.db_query_cache_size,
+)
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session factories; objects stay readable after commit instead of
+# being reloaded, and expired attributes cannot lazy-load under asyncio anyway
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 
-def get_db() -> Session:
-    """Get database session."""
-    db = SessionLocal()
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Provide a transactional scope around a series of operations."""
+    session = SessionLocal()
     try:
-        yield db
+        yield session
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
     finally:
-        db.close()
+        session.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Get async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
 
 
 def init_database():
@@ -33,7 +69,9 @@ def init_database():
     from models.job import StoryJob
     from models.auction import Auction, Bid, AuctionItem, Category
 
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    # One catalog query on a warm start instead of a has-table check per model
+    existing_tables = set(inspect(engine).get_table_names())
+    if not existing_tables.issuperset(Base.metadata.tables):
+        Base.metadata.create_all(bind=engine)
 
 
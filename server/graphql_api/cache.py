@@ -0,0 +1,38 @@
+"""
+In-process caches for small, rarely changing GraphQL data.
+"""
+
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Map of keys to values that expire ``ttl`` seconds after being stored."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        # Evict expired entries on write, so keys that are never read again
+        # don't accumulate
+        self._entries = {k: entry for k, entry in self._entries.items() if entry[0] >= now}
+        self._entries[key] = (now + self.ttl, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Categories are read on nearly every page and change rarely. Entries are
+# keyed by category ID, plus "all" for the full list. The GraphQL context
+# clears the cache once a mutation's changes are committed; the TTL bounds how
+# stale other worker processes can be.
+category_cache = TTLCache(ttl=60)
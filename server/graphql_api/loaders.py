@@ -0,0 +1,36 @@
+"""
+Per-request DataLoaders for the auction system.
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from strawberry.dataloader import DataLoader
+
+from models.auction import Auction as AuctionModel, Bid as BidModel
+
+
+def create_loaders(db: AsyncSession) -> Dict[str, DataLoader]:
+    """Create DataLoaders bound to the request's database session."""
+    # Sibling query fields resolve concurrently and may dispatch batches at
+    # the same time, but an AsyncSession runs one statement at a time
+    session_lock = asyncio.Lock()
+
+    async def load_auctions(keys: List[int]) -> List[Optional[AuctionModel]]:
+        async with session_lock:
+            auctions = await db.scalars(select(AuctionModel).where(AuctionModel.id.in_(keys)))
+        auctions_by_id = {auction.id: auction for auction in auctions}
+        return [auctions_by_id.get(key) for key in keys]
+
+    async def load_bids(keys: List[int]) -> List[Optional[BidModel]]:
+        async with session_lock:
+            bids = await db.scalars(select(BidModel).where(BidModel.id.in_(keys)))
+        bids_by_id = {bid.id: bid for bid in bids}
+        return [bids_by_id.get(key) for key in keys]
+
+    return {
+        "auction_loader": DataLoader(load_fn=load_auctions),
+        "bid_loader": DataLoader(load_fn=load_bids),
+    }
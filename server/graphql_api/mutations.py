@@ -2,24 +2,124 @@
 GraphQL mutations for the auction system.
 """
 
-from typing import Optional, List, Any
+from contextlib import asynccontextmanager
+from typing import Optional, List, Any, AsyncIterator, Dict, Tuple
 import strawberry
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from db.database import get_db
+from strawberry.types import Info
+from sqlalchemy import case, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
 from models.user import User as UserModel
 from models.story import Story as StoryModel, StoryNode as StoryNodeModel
 from models.job import StoryJob as StoryJobModel
-from models.auction import Auction as AuctionModel, Bid as BidModel, Category as CategoryModel, AuctionItem as AuctionItemModel, AuctionStatus, BidStatus
+from models.auction import Auction as AuctionModel, Bid as BidModel, Category as CategoryModel, AuctionItem as AuctionItemModel, AuctionStatus, BidStatus, to_cents
+from .cache import category_cache
 from .types import User, Story, StoryNode, StoryJob, Auction, Bid, Category, AuctionItem
+import dataclasses
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
+from operator import attrgetter
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
+class MutationError(Exception):
+    """A mutation failure whose message is safe to show the client as-is."""
+
+
+@asynccontextmanager
+async def db_tx(db: AsyncSession, action: str) -> AsyncIterator[None]:
+    """Run a mutation body inside a savepoint and turn failures into client errors.
+
+    ``action`` names the operation in log messages (e.g. "creating user").
+    """
+    try:
+        async with db.begin_nested():
+            yield
+    except MutationError:
+        # Raised on purpose with a client-facing message; pass it through
+        raise
+    except ValueError as e:
+        logger.error("Validation error %s: %s", action, e)
+        raise MutationError(f"Invalid input: {str(e)}")
+    except SQLAlchemyError as e:
+        logger.error("Database error %s: %s", action, e)
+        raise MutationError("Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error %s: %s", action, e)
+        raise MutationError("An unexpected error occurred")
+
+
+def apply_patch(obj: Any, patch: Any, fields: Tuple[str, ...]) -> None:
+    """Copy every field of an update input that was provided onto its model."""
+    for name, value in zip(fields, attrgetter(*fields)(patch)):
+        if value is not None:
+            setattr(obj, name, value)
+
+
+# Largest amount a BigInteger cents column can hold
+MAX_CENTS = 2**63 - 1
+
+
+def money_cents(amount: Optional[Decimal], field: str) -> Optional[int]:
+    """Validate a money input and convert it to whole cents.
+
+    Rejects NaN and infinities, and amounts finer than a cent, which would
+    otherwise be rounded away silently.
+    """
+    if amount is None:
+        return None
+    if not amount.is_finite():
+        raise MutationError(f"{field} must be a finite amount")
+    if amount.normalize().as_tuple().exponent < -2:
+        raise MutationError(f"{field} cannot have more than 2 decimal places")
+    cents = to_cents(amount)
+    if abs(cents) > MAX_CENTS:
+        raise MutationError(f"{field} is too large")
+    return cents
+
+
+def as_utc(value: datetime) -> datetime:
+    """Treat a naive datetime input as UTC so it compares with aware ones."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def place_bid_statement(auction_id: int, bidder_id: int, amount: Decimal):
+    """Build an INSERT ... SELECT that only creates the bid when the auction accepts it.
+
+    The auction must be active and the amount must reach the minimum bid
+    (the starting price for the first bid, otherwise the current price plus
+    the increment). When either check fails no row is inserted or returned.
+    """
+    amount_cents = to_cents(amount)
+    has_bids = select(BidModel.id).where(BidModel.auction_id == auction_id).exists()
+    minimum_bid = case(
+        (has_bids, AuctionModel.current_price_cents + AuctionModel.min_bid_increment_cents),
+        else_=AuctionModel.starting_price_cents,
+    )
+    accepted = select(
+        AuctionModel.id,
+        literal(bidder_id),
+        literal(amount_cents, BidModel.amount_cents.type),
+        literal(BidStatus.PENDING, BidModel.status.type),
+    ).where(
+        AuctionModel.id == auction_id,
+        AuctionModel.status == AuctionStatus.ACTIVE,
+        minimum_bid <= amount_cents,
+    )
+    return (
+        insert(BidModel)
+        .from_select(["auction_id", "bidder_id", "amount_cents", "status"], accepted)
+        .returning(*BidModel.__table__.columns)
+    )
+
+
 @strawberry.input
 class CreateUserInput:
     username: str
@@ -61,11 +161,11 @@ class CreateCategoryInput:
 class CreateAuctionInput:
     title: str
     description: str
-    starting_price: float
-    reserve_price: Optional[float] = None
-    min_bid_increment: float = 1.0
-    start_time: str  # ISO datetime string
-    end_time: str  # ISO datetime string
+    starting_price: Decimal
+    reserve_price: Optional[Decimal] = None
+    min_bid_increment: Decimal = Decimal("1.00")
+    start_time: datetime
+    end_time: datetime
     auto_extend_minutes: int = 5
     seller_id: int
     category_id: int
@@ -84,7 +184,7 @@ class CreateAuctionItemInput:
 class CreateBidInput:
     auction_id: int
     bidder_id: int
-    amount: float
+    amount: Decimal
 
 
 @strawberry.input
@@ -93,7 +193,7 @@ class UpdateStoryJobInput:
     status: Optional[str] = None
     story_id: Optional[int] = None
     error: Optional[str] = None
-    completed_at: Optional[str] = None  # ISO datetime string
+    completed_at: Optional[datetime] = None
 
 
 @strawberry.input
@@ -101,481 +201,303 @@ class UpdateAuctionInput:
     id: int
     title: Optional[str] = None
     description: Optional[str] = None
-    current_price: Optional[float] = None
-    status: Optional[str] = None
+    current_price: Optional[Decimal] = None
+    status: Optional[AuctionStatus] = None
     winner_user_id: Optional[int] = None
     current_highest_bid_id: Optional[int] = None
 
 
+# Field names of each input type, introspected once at import
+INPUT_FIELDS: Dict[type, Tuple[str, ...]] = {
+    cls: tuple(field.name for field in dataclasses.fields(cls))
+    for cls in (
+        CreateUserInput, CreateStoryInput, CreateStoryNodeInput, CreateStoryJobInput,
+        CreateCategoryInput, CreateAuctionInput, CreateAuctionItemInput, CreateBidInput,
+        UpdateStoryJobInput, UpdateAuctionInput,
+    )
+}
+
+# Fields copied from update inputs onto their models when provided
+STORY_JOB_PATCH_FIELDS = tuple(name for name in INPUT_FIELDS[UpdateStoryJobInput] if name != "id")
+AUCTION_PATCH_FIELDS = tuple(name for name in INPUT_FIELDS[UpdateAuctionInput] if name != "id")
+
+
+def input_values(input: Any) -> Dict[str, Any]:
+    """Copy a Strawberry input into a dict of ORM keyword arguments."""
+    return {name: getattr(input, name) for name in INPUT_FIELDS[type(input)]}
+
+
 @strawberry.type
 class Mutation:
     @strawberry.mutation
-    def create_user(self, input: CreateUserInput) -> User:
+    async def create_user(self, info: Info, input: CreateUserInput) -> User:
         """Create a new user."""
-        try:
-            db = next(get_db())
-            user = UserModel(username=input.username)
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            logger.info(f"Created user with ID: {user.id}")
-            return User(id=user.id, username=user.username)
-        except IntegrityError as e:
-            logger.error(f"Integrity error creating user: {e}")
-            db.rollback()
-            raise Exception("Username already exists")
-        except SQLAlchemyError as e:
-            logger.error(f"Database error creating user: {e}")
-            db.rollback()
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error creating user: {e}")
-            db.rollback()
-            raise Exception("An unexpected error occurred")
+        db: AsyncSession = info.context["db"]
+        async with db_tx(db, "creating user"):
+            # A taken username inserts nothing instead of raising
+            user = await db.scalar(
+                pg_insert(UserModel)
+                .values(**input_values(input))
+                .on_conflict_do_nothing(index_elements=["username"])
+                .returning(UserModel)
+            )
+        if user is None:
+            raise MutationError("Username already exists")
+        logger.info("Created user with ID: %s", user.id)
+        return User.from_model(user)
 
     @strawberry.mutation
-    def create_story(self, input: CreateStoryInput) -> Story:
+    async def create_story(self, info: Info, input: CreateStoryInput) -> Story:
         """Create a new story."""
-        try:
-            db = next(get_db())
-            story = StoryModel(title=input.title, session_id=input.session_id)
+        db: AsyncSession = info.context["db"]
+        async with db_tx(db, "creating story"):
+            # Start with an empty collection so reading it back doesn't query
+            story = StoryModel(**input_values(input), nodes=[])
             db.add(story)
-            db.commit()
-            db.refresh(story)
-            logger.info(f"Created story with ID: {story.id}")
-            return Story(
-                id=story.id,
-                title=story.title,
-                session_id=story.session_id,
-                created_at=story.created_at,
-                updated_at=story.updated_at,
-                nodes=[]
-            )
-        except SQLAlchemyError as e:
-            logger.error(f"Database error creating story: {e}")
-            db.rollback()
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error creating story: {e}")
-            db.rollback()
-            raise Exception("An unexpected error occurred")
+            await db.flush()
+        logger.info("Created story with ID: %s", story.id)
+        return Story.from_model(story)
 
     @strawberry.mutation
-    def create_story_node(self, input: CreateStoryNodeInput) -> StoryNode:
+    async def create_story_node(self, info: Info, input: CreateStoryNodeInput) -> StoryNode:
         """Create a new story node."""
-        try:
-            db = next(get_db())
-            node = StoryNodeModel(
-                story_id=input.story_id,
-                content=input.content,
-                is_ending=input.is_ending,
-                is_root=input.is_root,
-                is_winning_ending=input.is_winning_ending,
-                options=input.options
-            )
+        db: AsyncSession = info.context["db"]
+        async with db_tx(db, "creating story node"):
+            node = StoryNodeModel(**input_values(input))
             db.add(node)
-            db.commit()
-            db.refresh(node)
-            logger.info(f"Created story node with ID: {node.id}")
-            return StoryNode(
-                id=node.id,
-                story_id=node.story_id,
-                content=node.content,
-                is_ending=node.is_ending,
-                is_root=node.is_root,
-                is_winning_ending=node.is_winning_ending,
-                options=node.options
-            )
-        except SQLAlchemyError as e:
-            logger.error(f"Database error creating story node: {e}")
-            db.rollback()
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error creating story node: {e}")
-            db.rollback()
-            raise Exception("An unexpected error occurred")
+            await db.flush()
+        # The story's cached complete response no longer lists all its nodes
+        info.context["stale_story_ids"].add(node.story_id)
+        logger.info("Created story node with ID: %s", node.id)
+        return StoryNode.from_model(node)
 
     @strawberry.mutation
-    def create_story_job(self, input: CreateStoryJobInput) -> StoryJob:
+    async def create_story_job(self, info: Info, input: CreateStoryJobInput) -> StoryJob:
         """Create a new story job."""
-        try:
-            db = next(get_db())
-            job = StoryJobModel(
-                job_id=input.job_id,
-                session_id=input.session_id,
-                theme=input.theme,
-                status=input.status
-            )
+        db: AsyncSession = info.context["db"]
+        async with db_tx(db, "creating story job"):
+            job = StoryJobModel(**input_values(input))
             db.add(job)
-            db.commit()
-            db.refresh(job)
-            logger.info(f"Created story job with ID: {job.id}")
-            return StoryJob(
-                id=job.id,
-                job_id=job.job_id,
-                session_id=job.session_id,
-                theme=job.theme,
-                status=job.status,
-                story_id=job.story_id,
-                error=job.error,
-                created_at=job.created_at,
-                completed_at=job.completed_at
-            )
-        except SQLAlchemyError as e:
-            logger.error(f"Database error creating story job: {e}")
-            db.rollback()
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error creating story job: {e}")
-            db.rollback()
-            raise Exception("An unexpected error occurred")
+            await db.flush()
+        logger.info("Created story job with ID: %s", job.id)
+        return StoryJob.from_model(job)
 
     @strawberry.mutation
-    def update_story_job(self, input: UpdateStoryJobInput) -> Optional[StoryJob]:
+    async def update_story_job(self, info: Info, input: UpdateStoryJobInput) -> Optional[StoryJob]:
         """Update a story job."""
-        try:
-            db = next(get_db())
-            job = db.query(StoryJobModel).filter(StoryJobModel.id == input.id).first()
+        db: AsyncSession = info.context["db"]
+        async with db_tx(db, "updating story job"):
+            job = await db.get(StoryJobModel, input.id)
             if not job:
-                logger.warning(f"Story job with ID {input.id} not found")
+                logger.warning("Story job with ID %s not found", input.id)
                 return None
 
-            if input.status is not None:
-                job.status = input.status
-            if input.story_id is not None:
-                job.story_id = input.story_id
-            if input.error is not None:
-                job.error = input.error
-            if input.completed_at is not None:
-                job.completed_at = datetime.fromisoformat(input.completed_at)
-
-            db.commit()
-            db.refresh(job)
-            logger.info(f"Updated story job with ID: {job.id}")
-            return StoryJob(
-                id=job.id,
-                job_id=job.job_id,
-                session_id=job.session_id,
-                theme=job.theme,
-                status=job.status,
-                story_id=job.story_id,
-                error=job.error,
-                created_at=job.created_at,
-                completed_at=job.completed_at
-            )
-        except SQLAlchemyError as e:
-            logger.error(f"Database error updating story job: {e}")
-            db.rollback()
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error updating story job: {e}")
-            db.rollback()
-            raise Exception("An unexpected error occurred")
+            apply_patch(job, input, STORY_JOB_PATCH_FIELDS)
+            await db.flush()
+        logger.info("Updated story job with ID: %s", job.id)
+        return StoryJob.from_model(job)
 
     @strawberry.mutation
-    def create_category(self, input: CreateCategoryInput) -> Category:
+    async def create_category(self, info: Info, input: CreateCategoryInput) -> Category:
         """Create a new category."""
-        try:
-            db = next(get_db())
-            category = CategoryModel(
-                name=input.name,
-                description=input.description,
-                slug=input.slug,
-                is_active=input.is_active
-            )
-            db.add(category)
-            db.commit()
-            db.refresh(category)
-            logger.info(f"Created category with ID: {category.id}")
-            return Category(
-                id=category.id,
-                name=category.name,
-                description=category.description,
-                slug=category.slug,
-                is_active=category.is_active,
-                created_at=category.created_at,
-                updated_at=category.updated_at
+        db: AsyncSession = info.context["db"]
+        async with db_tx(db, "creating category"):
+            # A taken name or slug inserts nothing instead of raising
+            category = await db.scalar(
+                pg_insert(CategoryModel)
+                .values(**input_values(input))
+                .on_conflict_do_nothing()
+                .returning(CategoryModel)
             )
-        except IntegrityError as e:
-            logger.error(f"Integrity error creating category: {e}")
-            db.rollback()
-            raise Exception("Category name or slug already exists")
-        except SQLAlchemyError as e:
-            logger.error(f"Database error creating category: {e}")
-            db.rollback()
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error creating category: {e}")
-            db.rollback()
-            raise Exception("An unexpected error occurred")
+        if category is None:
+            raise MutationError("Category name or slug already exists")
+        info.context["stale_caches"].add(category_cache)
+        logger.info("Created category with ID: %s", category.id)
+        return Category.from_model(category)
 
     @strawberry.mutation
-    def create_auction(self, input: CreateAuctionInput) -> Auction:
+    async def create_auction(self, info: Info, input: CreateAuctionInput) -> Auction:
         """Create a new auction."""
-        try:
-            db = next(get_db())
-
-            # Validate input
-            if input.starting_price < 0:
-                raise Exception("Starting price must be non-negative")
-            if input.min_bid_increment <= 0:
-                raise Exception("Minimum bid increment must be positive")
-
-            start_time = datetime.fromisoformat(input.start_time)
-            end_time = datetime.fromisoformat(input.end_time)
-
-            if end_time <= start_time:
-                raise Exception("End time must be after start time")
-
+        db: AsyncSession = info.context["db"]
+
+        # Validate input before touching the database
+        if money_cents(input.starting_price, "Starting price") < 0:
+            raise MutationError("Starting price must be non-negative")
+        if money_cents(input.min_bid_increment, "Minimum bid increment") <= 0:
+            raise MutationError("Minimum bid increment must be positive")
+        money_cents(input.reserve_price, "Reserve price")
+        input.start_time = as_utc(input.start_time)
+        input.end_time = as_utc(input.end_time)
+        if input.end_time <= input.start_time:
+            raise MutationError("Invalid input: end time must be after start time")
+
+        async with db_tx(db, "creating auction"):
+            # Start with empty collections so reading them back doesn't query
             auction = AuctionModel(
-                title=input.title,
-                description=input.description,
-                starting_price=Decimal(str(input.starting_price)),
-                reserve_price=Decimal(str(input.reserve_price)) if input.reserve_price else None,
-                current_price=Decimal(str(input.starting_price)),
-                min_bid_increment=Decimal(str(input.min_bid_increment)),
-                start_time=start_time,
-                end_time=end_time,
-                auto_extend_minutes=input.auto_extend_minutes,
+                **input_values(input),
+                current_price=input.starting_price,
                 status=AuctionStatus.DRAFT,
-                seller_id=input.seller_id,
-                category_id=input.category_id
-            )
-            db.add(auction)
-            db.commit()
-            db.refresh(auction)
-            logger.info(f"Created auction with ID: {auction.id}")
-            return Auction(
-                id=auction.id,
-                title=auction.title,
-                description=auction.description,
-                starting_price=auction.starting_price,
-                reserve_price=auction.reserve_price,
-                current_price=auction.current_price,
-                min_bid_increment=auction.min_bid_increment,
-                start_time=auction.start_time,
-                end_time=auction.end_time,
-                auto_extend_minutes=auction.auto_extend_minutes,
-                status=auction.status,
-                seller_id=auction.seller_id,
-                category_id=auction.category_id,
-                winner_user_id=auction.winner_user_id,
-                current_highest_bid_id=auction.current_highest_bid_id,
-                created_at=auction.created_at,
-                updated_at=auction.updated_at,
-                current_highest_bid=None,
                 bids=[],
                 auction_items=[]
             )
-        except ValueError as e:
-            logger.error(f"Validation error creating auction: {e}")
-            raise Exception(f"Invalid input: {str(e)}")
-        except SQLAlchemyError as e:
-            logger.error(f"Database error creating auction: {e}")
-            db.rollback()
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error creating auction: {e}")
-            db.rollback()
-            raise Exception("An unexpected error occurred")
+            db.add(auction)
+            await db.flush()
+        logger.info("Created auction with ID: %s", auction.id)
+        return Auction.from_model(auction)
 
     @strawberry.mutation
-    def update_auction(self, input: UpdateAuctionInput) -> Optional[Auction]:
+    async def update_auction(self, info: Info, input: UpdateAuctionInput) -> Optional[Auction]:
         """Update an auction."""
-        try:
-            db = next(get_db())
-            auction = db.query(AuctionModel).filter(AuctionModel.id == input.id).first()
+        db: AsyncSession = info.context["db"]
+
+        # Validate input before touching the database
+        current_price_cents = money_cents(input.current_price, "Current price")
+        if current_price_cents is not None and current_price_cents < 0:
+            raise MutationError("Current price must be non-negative")
+
+        async with db_tx(db, "updating auction"):
+            # Load the auction together with its related data up front
+            auction = await db.scalar(
+                select(AuctionModel)
+                .options(
+                    selectinload(AuctionModel.bids),
+                    selectinload(AuctionModel.auction_items),
+                )
+                .execution_options(populate_existing=True)
+                .where(AuctionModel.id == input.id)
+            )
             if not auction:
-                logger.warning(f"Auction with ID {input.id} not found")
+                logger.warning("Auction with ID %s not found", input.id)
                 return None
 
-            if input.title is not None:
-                auction.title = input.title
-            if input.description is not None:
-                auction.description = input.description
-            if input.current_price is not None:
-                if input.current_price < 0:
-                    raise Exception("Current price must be non-negative")
-                auction.current_price = Decimal(str(input.current_price))
-            if input.status is not None:
-                auction.status = AuctionStatus(input.status)
-            if input.winner_user_id is not None:
-                auction.winner_user_id = input.winner_user_id
-            if input.current_highest_bid_id is not None:
-                auction.current_highest_bid_id = input.current_highest_bid_id
-
-            db.commit()
-            db.refresh(auction)
-
-            # Get related data
-            bids = db.query(BidModel).filter(BidModel.auction_id == auction.id).all()
-            auction_items = db.query(AuctionItemModel).filter(AuctionItemModel.auction_id == auction.id).all()
-
-            bid_list = [
-                Bid(
-                    id=bid.id,
-                    auction_id=bid.auction_id,
-                    bidder_id=bid.bidder_id,
-                    amount=bid.amount,
-                    status=bid.status,
-                    created_at=bid.created_at,
-                    updated_at=bid.updated_at
-                ) for bid in bids
-            ]
-
-            item_list = [
-                AuctionItem(
-                    id=item.id,
-                    auction_id=item.auction_id,
-                    name=item.name,
-                    description=item.description,
-                    condition=item.condition,
-                    quantity=item.quantity,
-                    created_at=item.created_at,
-                    updated_at=item.updated_at
-                ) for item in auction_items
-            ]
-
-            current_highest_bid = None
-            if auction.current_highest_bid:
-                current_highest_bid = Bid(
-                    id=auction.current_highest_bid.id,
-                    auction_id=auction.current_highest_bid.auction_id,
-                    bidder_id=auction.current_highest_bid.bidder_id,
-                    amount=auction.current_highest_bid.amount,
-                    status=auction.current_highest_bid.status,
-                    created_at=auction.current_highest_bid.created_at,
-                    updated_at=auction.current_highest_bid.updated_at
-                )
-
-            logger.info(f"Updated auction with ID: {auction.id}")
-            return Auction(
-                id=auction.id,
-                title=auction.title,
-                description=auction.description,
-                starting_price=auction.starting_price,
-                reserve_price=auction.reserve_price,
-                current_price=auction.current_price,
-                min_bid_increment=auction.min_bid_increment,
-                start_time=auction.start_time,
-                end_time=auction.end_time,
-                auto_extend_minutes=auction.auto_extend_minutes,
-                status=auction.status,
-                seller_id=auction.seller_id,
-                category_id=auction.category_id,
-                winner_user_id=auction.winner_user_id,
-                current_highest_bid_id=auction.current_highest_bid_id,
-                created_at=auction.created_at,
-                updated_at=auction.updated_at,
-                current_highest_bid=current_highest_bid,
-                bids=bid_list,
-                auction_items=item_list
-            )
-        except ValueError as e:
-            logger.error(f"Validation error updating auction: {e}")
-            raise Exception(f"Invalid input: {str(e)}")
-        except SQLAlchemyError as e:
-            logger.error(f"Database error updating auction: {e}")
-            db.rollback()
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error updating auction: {e}")
-            db.rollback()
-            raise Exception("An unexpected error occurred")
+            apply_patch(auction, input, AUCTION_PATCH_FIELDS)
+            await db.flush()
+        logger.info("Updated auction with ID: %s", auction.id)
+        return Auction.from_model(auction)
 
     @strawberry.mutation
-    def create_auction_item(self, input: CreateAuctionItemInput) -> AuctionItem:
+    async def create_auction_item(self, info: Info, input: CreateAuctionItemInput) -> AuctionItem:
         """Create a new auction item."""
-        try:
-            db = next(get_db())
-
-            # Validate input
-            if input.quantity <= 0:
-                raise Exception("Quantity must be positive")
-
-            item = AuctionItemModel(
-                auction_id=input.auction_id,
-                name=input.name,
-                description=input.description,
-                condition=input.condition,
-                quantity=input.quantity
-            )
-            db.add(item)
-            db.commit()
-            db.refresh(item)
-            logger.info(f"Created auction item with ID: {item.id}")
-            return AuctionItem(
-                id=item.id,
-                auction_id=item.auction_id,
-                name=item.name,
-                description=item.description,
-                condition=item.condition,
-                quantity=item.quantity,
-                created_at=item.created_at,
-                updated_at=item.updated_at
-            )
-        except ValueError as e:
-            logger.error(f"Validation error creating auction item: {e}")
-            raise Exception(f"Invalid input: {str(e)}")
-        except SQLAlchemyError as e:
-            logger.error(f"Database error creating auction item: {e}")
-            db.rollback()
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error creating auction item: {e}")
-            db.rollback()
-            raise Exception("An unexpected error occurred")
-
-    @strawberry.mutation
-    def create_bid(self, input: CreateBidInput) -> Bid:
-        """Create a new bid."""
-        try:
-            db = next(get_db())
+        db: AsyncSession = info.context["db"]
 
-            # Validate input
-            if input.amount <= 0:
-                raise Exception("Bid amount must be positive")
+        # Validate input before touching the database
+        if input.quantity <= 0:
+            raise MutationError("Quantity must be positive")
 
-            # Check if auction exists and is active
-            auction = db.query(AuctionModel).filter(AuctionModel.id == input.auction_id).first()
-            if not auction:
-                raise Exception("Auction not found")
+        async with db_tx(db, "creating auction item"):
+            item = AuctionItemModel(**input_values(input))
+            db.add(item)
+            await db.flush()
+        logger.info("Created auction item with ID: %s", item.id)
+        return AuctionItem.from_model(item)
 
-            if auction.status != AuctionStatus.ACTIVE:
-                raise Exception("Auction is not active")
+    @strawberry.mutation
+    async def create_auction_items(self, info: Info, inputs: List[CreateAuctionItemInput]) -> List[AuctionItem]:
+        """Create several auction items with a single INSERT."""
+        db: AsyncSession = info.context["db"]
+        if not inputs:
+            return []
+
+        # Validate input before touching the database
+        if any(item.quantity <= 0 for item in inputs):
+            raise MutationError("Quantity must be positive")
+
+        async with db_tx(db, "creating auction items"):
+            items = (await db.scalars(
+                insert(AuctionItemModel).returning(AuctionItemModel, sort_by_parameter_order=True),
+                [input_values(item) for item in inputs],
+            )).all()
+        logger.info("Created %s auction items", len(items))
+        return [AuctionItem.from_model(item) for item in items]
 
-            # Check if bid meets minimum requirements
-            min_bid = auction.get_minimum_bid()
-            if input.amount < min_bid:
-                raise Exception(f"Bid must be at least {min_bid}")
+    @strawberry.mutation
+    async def create_bid(self, info: Info, input: CreateBidInput) -> Bid:
+        """Create a new bid."""
+        db: AsyncSession = info.context["db"]
+
+        # Validate input before touching the database
+        if money_cents(input.amount, "Bid amount") <= 0:
+            raise MutationError("Bid amount must be positive")
+
+        async with db_tx(db, "creating bid"):
+            # Validate against the auction and insert in a single statement
+            bid = (await db.execute(
+                place_bid_statement(input.auction_id, input.bidder_id, input.amount)
+            )).first()
+
+            if bid is None:
+                # Nothing was inserted; look the auction up to explain why
+                auction = await info.context["auction_loader"].load(input.auction_id)
+                if not auction:
+                    raise MutationError("Auction not found")
+                if auction.status != AuctionStatus.ACTIVE:
+                    raise MutationError("Auction is not active")
+                # Same rule as place_bid_statement(), without loading the bids
+                highest_bid = await db.scalar(
+                    select(func.max(BidModel.amount_cents)).where(BidModel.auction_id == auction.id)
+                )
+                if highest_bid is None:
+                    min_bid = auction.starting_price
+                else:
+                    min_bid = auction.current_price + auction.min_bid_increment
+                raise MutationError(f"Bid must be at least {min_bid}")
+        logger.info("Created bid with ID: %s", bid.id)
+        return Bid.from_model(bid)
 
-            bid = BidModel(
-                auction_id=input.auction_id,
-                bidder_id=input.bidder_id,
-                amount=Decimal(str(input.amount)),
-                status=BidStatus.PENDING
-            )
-            db.add(bid)
-            db.commit()
-            db.refresh(bid)
-            logger.info(f"Created bid with ID: {bid.id}")
-            return Bid(
-                id=bid.id,
-                auction_id=bid.auction_id,
-                bidder_id=bid.bidder_id,
-                amount=bid.amount,
-                status=bid.status,
-                created_at=bid.created_at,
-                updated_at=bid.updated_at
-            )
-        except ValueError as e:
-            logger.error(f"Validation error creating bid: {e}")
-            raise Exception(f"Invalid input: {str(e)}")
-        except SQLAlchemyError as e:
-            logger.error(f"Database error creating bid: {e}")
-            db.rollback()
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error creating bid: {e}")
-            db.rollback()
-            raise Exception("An unexpected error occurred")
\ No newline at end of file
+    @strawberry.mutation
+    async def create_bids(self, info: Info, inputs: List[CreateBidInput]) -> List[Bid]:
+        """Create several bids with a single INSERT.
+
+        The bids are validated together and either all of them are placed or
+        none are.
+        """
+        db: AsyncSession = info.context["db"]
+        if not inputs:
+            return []
+
+        # Validate input before touching the database
+        if any(money_cents(bid.amount, "Bid amount") <= 0 for bid in inputs):
+            raise MutationError("Bid amount must be positive")
+
+        async with db_tx(db, "creating bids"):
+            # Lock the auctions so the checks below hold until the insert runs
+            auction_ids = {bid.auction_id for bid in inputs}
+            auctions = {
+                auction.id: auction
+                for auction in await db.scalars(
+                    select(AuctionModel).where(AuctionModel.id.in_(auction_ids)).with_for_update()
+                )
+            }
+            with_bids = set(await db.scalars(
+                select(BidModel.auction_id).where(BidModel.auction_id.in_(auction_ids)).distinct()
+            ))
+
+            for bid in inputs:
+                auction = auctions.get(bid.auction_id)
+                if not auction:
+                    raise MutationError("Auction not found")
+                if auction.status != AuctionStatus.ACTIVE:
+                    raise MutationError("Auction is not active")
+                # Same rule as Auction.get_minimum_bid()
+                if auction.id in with_bids:
+                    min_bid = auction.current_price + auction.min_bid_increment
+                else:
+                    min_bid = auction.starting_price
+                if bid.amount < min_bid:
+                    raise MutationError(f"Bid must be at least {min_bid}")
+                with_bids.add(auction.id)
+
+            bids = (await db.scalars(
+                insert(BidModel).returning(BidModel, sort_by_parameter_order=True),
+                [
+                    {
+                        "auction_id": bid.auction_id,
+                        "bidder_id": bid.bidder_id,
+                        "amount_cents": to_cents(bid.amount),
+                        "status": BidStatus.PENDING,
+                    }
+                    for bid in inputs
+                ],
+            )).all()
+        logger.info("Created %s bids", len(bids))
+        return [Bid.from_model(bid) for bid in bids]
@@ -2,376 +2,162 @@
 GraphQL queries for the auction system.
 """
 
-from typing import List, Optional
+import functools
+from typing import Any, Awaitable, Callable, List, Optional, TypeVar
 import strawberry
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import raiseload, selectinload
 from sqlalchemy.exc import SQLAlchemyError
-from db.database import get_db
+from db.database import AsyncSessionLocal
 from models.user import User as UserModel
 from models.story import Story as StoryModel, StoryNode as StoryNodeModel
 from models.job import StoryJob as StoryJobModel
-from models.auction import Auction as AuctionModel, Bid as BidModel, Category as CategoryModel, AuctionItem as AuctionItemModel
-from .types import User, Story, StoryNode, StoryJob, Auction, Bid, Category, AuctionItem
+from models.auction import Auction as AuctionModel, AuctionStatus, Category as CategoryModel
+from .cache import category_cache
+from .types import User, Story, StoryJob, Auction, Category
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-
-@strawberry.type
-class Query:
-    @strawberry.field
-    def user(self, id: int) -> Optional[User]:
-        """Get a user by ID."""
+R = TypeVar("R")
+
+# Fetch everything a result exposes in a fixed number of queries; any other
+# relationship access raises instead of silently issuing a lazy load
+AUCTION_LOAD_OPTIONS = (
+    selectinload(AuctionModel.bids),
+    selectinload(AuctionModel.auction_items),
+    raiseload("*"),
+)
+STORY_LOAD_OPTIONS = (
+    selectinload(StoryModel.nodes).undefer(StoryNodeModel.content),
+    raiseload("*"),
+)
+
+# List statements are built once; executing a prebuilt statement skips
+# reconstructing it and hits the engine's compiled-SQL cache directly
+ALL_USERS = select(UserModel)
+ALL_STORIES = select(StoryModel).options(*STORY_LOAD_OPTIONS)
+ALL_STORY_JOBS = select(StoryJobModel)
+ALL_AUCTIONS = select(AuctionModel).options(*AUCTION_LOAD_OPTIONS)
+# Matches the partial index idx_auction_active_end
+ACTIVE_AUCTIONS = ALL_AUCTIONS.where(AuctionModel.status == AuctionStatus.ACTIVE.value).order_by(
+    AuctionModel.end_time
+)
+ALL_CATEGORIES = select(CategoryModel)
+
+
+def resolver_error_handler(fn: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+    """Log a query resolver's failure and re-raise it as a client-facing error."""
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> R:
         try:
-            db = next(get_db())
-            user = db.query(UserModel).filter(UserModel.id == id).first()
-            if user:
-                return User(id=user.id, username=user.username)
-            return None
+            return await fn(*args, **kwargs)
         except SQLAlchemyError as e:
-            logger.error(f"Database error in user query: {e}")
+            logger.error("Database error in %s query: %s", fn.__name__, e)
             raise Exception("Database error occurred")
         except Exception as e:
-            logger.error(f"Unexpected error in user query: {e}")
+            logger.error("Unexpected error in %s query: %s", fn.__name__, e)
             raise Exception("An unexpected error occurred")
 
+    return wrapper
+
+
+# Each resolver opens its own short-lived session rather than sharing the
+# request's, because an AsyncSession cannot be used concurrently and the
+# executor gathers sibling root fields at the same time.
+@strawberry.type
+class Query:
+    @strawberry.field
+    @resolver_error_handler
+    async def user(self, id: int) -> Optional[User]:
+        """Get a user by ID."""
+        async with AsyncSessionLocal() as db:
+            user = await db.get(UserModel, id)
+        return User.from_model(user) if user else None
+
     @strawberry.field
-    def users(self) -> List[User]:
+    @resolver_error_handler
+    async def users(self) -> List[User]:
         """Get all users."""
-        try:
-            db = next(get_db())
-            users = db.query(UserModel).all()
-            return [User(id=user.id, username=user.username) for user in users]
-        except SQLAlchemyError as e:
-            logger.error(f"Database error in users query: {e}")
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error in users query: {e}")
-            raise Exception("An unexpected error occurred")
+        async with AsyncSessionLocal() as db:
+            users = (await db.scalars(ALL_USERS)).all()
+        return [User.from_model(user) for user in users]
 
     @strawberry.field
-    def story(self, id: int) -> Optional[Story]:
+    @resolver_error_handler
+    async def story(self, id: int) -> Optional[Story]:
         """Get a story by ID."""
-        try:
-            db = next(get_db())
-            story = db.query(StoryModel).filter(StoryModel.id == id).first()
-            if story:
-                nodes = db.query(StoryNodeModel).filter(StoryNodeModel.story_id == story.id).all()
-                story_nodes = [
-                    StoryNode(
-                        id=node.id,
-                        story_id=node.story_id,
-                        content=node.content,
-                        is_ending=node.is_ending,
-                        is_root=node.is_root,
-                        is_winning_ending=node.is_winning_ending,
-                        options=node.options
-                    ) for node in nodes
-                ]
-                return Story(
-                    id=story.id,
-                    title=story.title,
-                    session_id=story.session_id,
-                    created_at=story.created_at,
-                    updated_at=story.updated_at,
-                    nodes=story_nodes
-                )
-            return None
-        except SQLAlchemyError as e:
-            logger.error(f"Database error in story query: {e}")
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error in story query: {e}")
-            raise Exception("An unexpected error occurred")
+        async with AsyncSessionLocal() as db:
+            story = await db.get(StoryModel, id, options=STORY_LOAD_OPTIONS)
+        return Story.from_model(story) if story else None
 
     @strawberry.field
-    def stories(self) -> List[Story]:
+    @resolver_error_handler
+    async def stories(self) -> List[Story]:
         """Get all stories."""
-        try:
-            db = next(get_db())
-            stories = db.query(StoryModel).all()
-            result = []
-            for story in stories:
-                nodes = db.query(StoryNodeModel).filter(StoryNodeModel.story_id == story.id).all()
-                story_nodes = [
-                    StoryNode(
-                        id=node.id,
-                        story_id=node.story_id,
-                        content=node.content,
-                        is_ending=node.is_ending,
-                        is_root=node.is_root,
-                        is_winning_ending=node.is_winning_ending,
-                        options=node.options
-                    ) for node in nodes
-                ]
-                result.append(Story(
-                    id=story.id,
-                    title=story.title,
-                    session_id=story.session_id,
-                    created_at=story.created_at,
-                    updated_at=story.updated_at,
-                    nodes=story_nodes
-                ))
-            return result
-        except SQLAlchemyError as e:
-            logger.error(f"Database error in stories query: {e}")
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error in stories query: {e}")
-            raise Exception("An unexpected error occurred")
+        async with AsyncSessionLocal() as db:
+            stories = (await db.scalars(ALL_STORIES)).all()
+        return [Story.from_model(story) for story in stories]
 
     @strawberry.field
-    def story_job(self, id: int) -> Optional[StoryJob]:
+    @resolver_error_handler
+    async def story_job(self, id: int) -> Optional[StoryJob]:
         """Get a story job by ID."""
-        try:
-            db = next(get_db())
-            job = db.query(StoryJobModel).filter(StoryJobModel.id == id).first()
-            if job:
-                return StoryJob(
-                    id=job.id,
-                    job_id=job.job_id,
-                    session_id=job.session_id,
-                    theme=job.theme,
-                    status=job.status,
-                    story_id=job.story_id,
-                    error=job.error,
-                    created_at=job.created_at,
-                    completed_at=job.completed_at
-                )
-            return None
-        except SQLAlchemyError as e:
-            logger.error(f"Database error in story_job query: {e}")
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error in story_job query: {e}")
-            raise Exception("An unexpected error occurred")
+        async with AsyncSessionLocal() as db:
+            job = await db.get(StoryJobModel, id)
+        return StoryJob.from_model(job) if job else None
 
     @strawberry.field
-    def story_jobs(self) -> List[StoryJob]:
+    @resolver_error_handler
+    async def story_jobs(self) -> List[StoryJob]:
         """Get all story jobs."""
-        try:
-            db = next(get_db())
-            jobs = db.query(StoryJobModel).all()
-            return [
-                StoryJob(
-                    id=job.id,
-                    job_id=job.job_id,
-                    session_id=job.session_id,
-                    theme=job.theme,
-                    status=job.status,
-                    story_id=job.story_id,
-                    error=job.error,
-                    created_at=job.created_at,
-                    completed_at=job.completed_at
-                ) for job in jobs
-            ]
-        except SQLAlchemyError as e:
-            logger.error(f"Database error in story_jobs query: {e}")
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error in story_jobs query: {e}")
-            raise Exception("An unexpected error occurred")
+        async with AsyncSessionLocal() as db:
+            jobs = (await db.scalars(ALL_STORY_JOBS)).all()
+        return [StoryJob.from_model(job) for job in jobs]
 
     @strawberry.field
-    def auction(self, id: int) -> Optional[Auction]:
+    @resolver_error_handler
+    async def auction(self, id: int) -> Optional[Auction]:
         """Get an auction by ID."""
-        try:
-            db = next(get_db())
-            auction = db.query(AuctionModel).filter(AuctionModel.id == id).first()
-            if auction:
-                bids = db.query(BidModel).filter(BidModel.auction_id == auction.id).all()
-                auction_items = db.query(AuctionItemModel).filter(AuctionItemModel.auction_id == auction.id).all()
-
-                bid_list = [
-                    Bid(
-                        id=bid.id,
-                        auction_id=bid.auction_id,
-                        bidder_id=bid.bidder_id,
-                        amount=bid.amount,
-                        status=bid.status,
-                        created_at=bid.created_at,
-                        updated_at=bid.updated_at
-                    ) for bid in bids
-                ]
-
-                item_list = [
-                    AuctionItem(
-                        id=item.id,
-                        auction_id=item.auction_id,
-                        name=item.name,
-                        description=item.description,
-                        condition=item.condition,
-                        quantity=item.quantity,
-                        created_at=item.created_at,
-                        updated_at=item.updated_at
-                    ) for item in auction_items
-                ]
-
-                current_highest_bid = None
-                if auction.current_highest_bid:
-                    current_highest_bid = Bid(
-                        id=auction.current_highest_bid.id,
-                        auction_id=auction.current_highest_bid.auction_id,
-                        bidder_id=auction.current_highest_bid.bidder_id,
-                        amount=auction.current_highest_bid.amount,
-                        status=auction.current_highest_bid.status,
-                        created_at=auction.current_highest_bid.created_at,
-                        updated_at=auction.current_highest_bid.updated_at
-                    )
-
-                return Auction(
-                    id=auction.id,
-                    title=auction.title,
-                    description=auction.description,
-                    starting_price=auction.starting_price,
-                    reserve_price=auction.reserve_price,
-                    current_price=auction.current_price,
-                    min_bid_increment=auction.min_bid_increment,
-                    start_time=auction.start_time,
-                    end_time=auction.end_time,
-                    auto_extend_minutes=auction.auto_extend_minutes,
-                    status=auction.status,
-                    seller_id=auction.seller_id,
-                    category_id=auction.category_id,
-                    winner_user_id=auction.winner_user_id,
-                    current_highest_bid_id=auction.current_highest_bid_id,
-                    created_at=auction.created_at,
-                    updated_at=auction.updated_at,
-                    current_highest_bid=current_highest_bid,
-                    bids=bid_list,
-                    auction_items=item_list
-                )
-            return None
-        except SQLAlchemyError as e:
-            logger.error(f"Database error in auction query: {e}")
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error in auction query: {e}")
-            raise Exception("An unexpected error occurred")
+        async with AsyncSessionLocal() as db:
+            auction = await db.get(AuctionModel, id, options=AUCTION_LOAD_OPTIONS)
+        return Auction.from_model(auction) if auction else None
 
     @strawberry.field
-    def auctions(self) -> List[Auction]:
-        """Get all auctions."""
-        try:
-            db = next(get_db())
-            auctions = db.query(AuctionModel).all()
-            result = []
-            for auction in auctions:
-                bids = db.query(BidModel).filter(BidModel.auction_id == auction.id).all()
-                auction_items = db.query(AuctionItemModel).filter(AuctionItemModel.auction_id == auction.id).all()
-
-                bid_list = [
-                    Bid(
-                        id=bid.id,
-                        auction_id=bid.auction_id,
-                        bidder_id=bid.bidder_id,
-                        amount=bid.amount,
-                        status=bid.status,
-                        created_at=bid.created_at,
-                        updated_at=bid.updated_at
-                    ) for bid in bids
-                ]
-
-                item_list = [
-                    AuctionItem(
-                        id=item.id,
-                        auction_id=item.auction_id,
-                        name=item.name,
-                        description=item.description,
-                        condition=item.condition,
-                        quantity=item.quantity,
-                        created_at=item.created_at,
-                        updated_at=item.updated_at
-                    ) for item in auction_items
-                ]
-
-                current_highest_bid = None
-                if auction.current_highest_bid:
-                    current_highest_bid = Bid(
-                        id=auction.current_highest_bid.id,
-                        auction_id=auction.current_highest_bid.auction_id,
-                        bidder_id=auction.current_highest_bid.bidder_id,
-                        amount=auction.current_highest_bid.amount,
-                        status=auction.current_highest_bid.status,
-                        created_at=auction.current_highest_bid.created_at,
-                        updated_at=auction.current_highest_bid.updated_at
-                    )
-
-                result.append(Auction(
-                    id=auction.id,
-                    title=auction.title,
-                    description=auction.description,
-                    starting_price=auction.starting_price,
-                    reserve_price=auction.reserve_price,
-                    current_price=auction.current_price,
-                    min_bid_increment=auction.min_bid_increment,
-                    start_time=auction.start_time,
-                    end_time=auction.end_time,
-                    auto_extend_minutes=auction.auto_extend_minutes,
-                    status=auction.status,
-                    seller_id=auction.seller_id,
-                    category_id=auction.category_id,
-                    winner_user_id=auction.winner_user_id,
-                    current_highest_bid_id=auction.current_highest_bid_id,
-                    created_at=auction.created_at,
-                    updated_at=auction.updated_at,
-                    current_highest_bid=current_highest_bid,
-                    bids=bid_list,
-                    auction_items=item_list
-                ))
-            return result
-        except SQLAlchemyError as e:
-            logger.error(f"Database error in auctions query: {e}")
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error in auctions query: {e}")
-            raise Exception("An unexpected error occurred")
+    @resolver_error_handler
+    async def auctions(self, active_only: bool = False) -> List[Auction]:
+        """Get all auctions, or only active ones ordered by end time."""
+        stmt = ACTIVE_AUCTIONS if active_only else ALL_AUCTIONS
+        async with AsyncSessionLocal() as db:
+            auctions = (await db.scalars(stmt)).all()
+        return [Auction.from_model(auction) for auction in auctions]
 
     @strawberry.field
-    def category(self, id: int) -> Optional[Category]:
+    @resolver_error_handler
+    async def category(self, id: int) -> Optional[Category]:
         """Get a category by ID."""
-        try:
-            db = next(get_db())
-            category = db.query(CategoryModel).filter(CategoryModel.id == id).first()
-            if category:
-                return Category(
-                    id=category.id,
-                    name=category.name,
-                    description=category.description,
-                    slug=category.slug,
-                    is_active=category.is_active,
-                    created_at=category.created_at,
-                    updated_at=category.updated_at
-                )
+        cached = category_cache.get(id)
+        if cached is not None:
+            return cached
+        async with AsyncSessionLocal() as db:
+            category = await db.get(CategoryModel, id)
+        if category is None:
             return None
-        except SQLAlchemyError as e:
-            logger.error(f"Database error in category query: {e}")
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error in category query: {e}")
-            raise Exception("An unexpected error occurred")
+        result = Category.from_model(category)
+        category_cache.set(id, result)
+        return result
 
     @strawberry.field
-    def categories(self) -> List[Category]:
+    @resolver_error_handler
+    async def categories(self) -> List[Category]:
         """Get all categories."""
-        try:
-            db = next(get_db())
-            categories = db.query(CategoryModel).all()
-            return [
-                Category(
-                    id=category.id,
-                    name=category.name,
-                    description=category.description,
-                    slug=category.slug,
-                    is_active=category.is_active,
-                    created_at=category.created_at,
-                    updated_at=category.updated_at
-                ) for category in categories
-            ]
-        except SQLAlchemyError as e:
-            logger.error(f"Database error in categories query: {e}")
-            raise Exception("Database error occurred")
-        except Exception as e:
-            logger.error(f"Unexpected error in categories query: {e}")
-            raise Exception("An unexpected error occurred")
\ No newline at end of file
+        cached = category_cache.get("all")
+        if cached is not None:
+            return cached
+        async with AsyncSessionLocal() as db:
+            categories = (await db.scalars(ALL_CATEGORIES)).all()
+        result = [Category.from_model(category) for category in categories]
+        category_cache.set("all", result)
+        return result
\ No newline at end of file
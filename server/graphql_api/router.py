@@ -2,12 +2,64 @@
 FastAPI router for GraphQL integration.
 """
 
+import logging
+from typing import AsyncIterator, Set
+
+import orjson
+from fastapi import Depends
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry.fastapi import GraphQLRouter
+from strawberry.http import GraphQLHTTPResponse
+
+from core.config import settings
+from core.redis import get_redis, story_cache_key
+from db.database import get_async_db
+from .loaders import create_loaders
 from .schema import schema
 
-# Export the GraphQL router with GraphiQL playground enabled
-router = GraphQLRouter(
+logger = logging.getLogger(__name__)
+
+
+async def get_context(db: AsyncSession = Depends(get_async_db)) -> AsyncIterator[dict]:
+    """Build the per-request GraphQL context around a single database session.
+
+    Resolvers only flush their changes; everything the request wrote is
+    committed once, after all operations in the request have run and before
+    the response is sent. Stories whose cached complete response went stale
+    are evicted after the commit, so a concurrent read cannot re-cache the
+    old version; in-process caches recorded in ``stale_caches`` are cleared
+    at the same point.
+    """
+    context = {"db": db, "stale_story_ids": set(), "stale_caches": set(), **create_loaders(db)}
+    yield context
+    await db.commit()
+    for cache in context["stale_caches"]:
+        cache.clear()
+    if context["stale_story_ids"]:
+        await evict_cached_stories(context["stale_story_ids"])
+
+
+async def evict_cached_stories(story_ids: Set[int]) -> None:
+    """Drop the cached complete responses of the given stories."""
+    try:
+        await get_redis().delete(*(story_cache_key(story_id) for story_id in story_ids))
+    except RedisError as e:
+        logger.warning("Story cache eviction failed for stories %s: %s", sorted(story_ids), e)
+
+
+class ORJSONGraphQLRouter(GraphQLRouter):
+    """GraphQL router that encodes responses with orjson instead of the json module."""
+
+    def encode_json(self, response_data: GraphQLHTTPResponse) -> bytes:
+        return orjson.dumps(response_data)
+
+
+# Export the GraphQL router; the GraphiQL playground and GET queries are
+# development conveniences, only served when DEBUG is on
+router = ORJSONGraphQLRouter(
     schema,
-    graphiql=True,  # Enable GraphQL Playground
-    allow_queries_via_get=True  # Allow queries via GET requests
-)
\ No newline at end of file
+    context_getter=get_context,
+    graphiql=settings.debug,
+    allow_queries_via_get=settings.debug,
+)
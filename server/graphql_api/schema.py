@@ -3,9 +3,7 @@ Main GraphQL schema for the auction system.
 """
 
 import strawberry
-from strawberry.extensions import AddValidationRules
-from graphql import ValidationRule
-from typing import List
+from strawberry.extensions import ParserCache, ValidationCache
 import logging
 
 from .queries import Query
@@ -14,17 +12,16 @@ from .mutations import Mutation
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Custom validation rule for better error handling
-class CustomValidationRule(ValidationRule):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        logger.info("GraphQL validation rule initialized")
+# Clients send a small set of distinct documents, so parsing and validating
+# each one once and reusing the result skips that work on repeat requests
+DOCUMENT_CACHE_SIZE = 256
 
 # Create schema with extensions
 schema = strawberry.Schema(
     query=Query,
     mutation=Mutation,
     extensions=[
-        AddValidationRules([CustomValidationRule])
+        ParserCache(maxsize=DOCUMENT_CACHE_SIZE),
+        ValidationCache(maxsize=DOCUMENT_CACHE_SIZE),
     ]
-)
\ No newline at end of file
+)
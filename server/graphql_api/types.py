@@ -4,15 +4,51 @@ GraphQL types for the auction system using Strawberry.
 
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional, Any
-from enum import Enum
+from operator import attrgetter
+from typing import Callable, Dict, List, Optional, Any
 import strawberry
+from strawberry.types import Info
+
+from models.auction import AuctionStatus as AuctionStatusModel, BidStatus as BidStatusModel, from_cents
+
+
+def column_reader(*fields: str) -> Callable[[Any], Dict[str, Any]]:
+    """Build a function that reads the given attributes off an ORM instance in one call."""
+    getter = attrgetter(*fields)
+    return lambda model: dict(zip(fields, getter(model)))
+
+
+_read_user = column_reader("id", "username")
+_read_story_node = column_reader(
+    "id", "story_id", "content", "is_ending", "is_root", "is_winning_ending", "options"
+)
+_read_story = column_reader("id", "title", "session_id", "created_at", "updated_at")
+_read_story_job = column_reader(
+    "id", "job_id", "session_id", "theme", "status", "story_id", "error", "created_at", "completed_at"
+)
+_read_category = column_reader(
+    "id", "name", "description", "slug", "is_active", "created_at", "updated_at"
+)
+_read_bid = column_reader("id", "auction_id", "bidder_id", "created_at", "updated_at")
+_read_auction_item = column_reader(
+    "id", "auction_id", "name", "description", "condition", "quantity", "created_at", "updated_at"
+)
+_read_auction = column_reader(
+    "id", "title", "description", "start_time", "end_time", "auto_extend_minutes",
+    "seller_id", "category_id", "winner_user_id", "current_highest_bid_id",
+    "created_at", "updated_at",
+)
+
 
 @strawberry.type
 class User:
     id: int
     username: str
 
+    @classmethod
+    def from_model(cls, user: Any) -> "User":
+        return cls(**_read_user(user))
+
 
 @strawberry.type
 class StoryNode:
@@ -24,6 +60,10 @@ class StoryNode:
     is_winning_ending: bool
     options: List[str]
 
+    @classmethod
+    def from_model(cls, node: Any) -> "StoryNode":
+        return cls(**_read_story_node(node))
+
 
 @strawberry.type
 class Story:
@@ -34,6 +74,13 @@ class Story:
     updated_at: datetime = strawberry.field(name="updated_at")
     nodes: List[StoryNode]
 
+    @classmethod
+    def from_model(cls, story: Any) -> "Story":
+        return cls(
+            **_read_story(story),
+            nodes=[StoryNode.from_model(node) for node in story.nodes],
+        )
+
 
 @strawberry.type
 class StoryJob:
@@ -47,24 +94,22 @@ class StoryJob:
     created_at: datetime
     completed_at: Optional[datetime]
 
+    @classmethod
+    def from_model(cls, job: Any) -> "StoryJob":
+        return cls(**_read_story_job(job))
 
-@strawberry.enum
-class AuctionStatus(Enum):
-    DRAFT = "draft"
-    PENDING = "pending"
-    ACTIVE = "active"
-    PAUSED = "paused"
-    ENDED = "ended"
-    CANCELLED = "cancelled"
-    SOLD = "sold"
 
+# The model enums double as GraphQL enums, so parsed input values can be
+# assigned to models directly. Status columns are plain strings, converted
+# back to these enums once in from_model()
+AuctionStatus = strawberry.enum(AuctionStatusModel, name="AuctionStatus")
+BidStatus = strawberry.enum(BidStatusModel, name="BidStatus")
 
-@strawberry.enum
-class BidStatus(Enum):
-    PENDING = "pending"
-    ACCEPTED = "accepted"
-    REJECTED = "rejected"
-    CANCELLED = "cancelled"
+# Plain dict lookups instead of Enum(value) per row. The enums subclass str,
+# so a member assigned in Python and not yet reloaded as a string hashes and
+# compares equal to its value and finds the same entry.
+_AUCTION_STATUS = {status.value: status for status in AuctionStatus}
+_BID_STATUS = {status.value: status for status in BidStatus}
 
 
 @strawberry.type
@@ -77,6 +122,10 @@ class Category:
     created_at: datetime
     updated_at: datetime
 
+    @classmethod
+    def from_model(cls, category: Any) -> "Category":
+        return cls(**_read_category(category))
+
 
 @strawberry.type
 class Bid:
@@ -88,6 +137,14 @@ class Bid:
     created_at: datetime
     updated_at: datetime
 
+    @classmethod
+    def from_model(cls, bid: Any) -> "Bid":
+        return cls(
+            **_read_bid(bid),
+            amount=from_cents(bid.amount_cents),
+            status=_BID_STATUS[bid.status],
+        )
+
 
 @strawberry.type
 class AuctionItem:
@@ -100,6 +157,10 @@ class AuctionItem:
     created_at: datetime
     updated_at: datetime
 
+    @classmethod
+    def from_model(cls, item: Any) -> "AuctionItem":
+        return cls(**_read_auction_item(item))
+
 
 @strawberry.type
 class Auction:
@@ -120,6 +181,26 @@ class Auction:
     current_highest_bid_id: Optional[int]
     created_at: datetime
     updated_at: datetime
-    current_highest_bid: Optional[Bid]
     bids: List[Bid]
-    auction_items: List[AuctionItem]
\ No newline at end of file
+    auction_items: List[AuctionItem]
+
+    @strawberry.field
+    async def current_highest_bid(self, info: Info) -> Optional[Bid]:
+        # Batched across every auction in the document by the request's bid loader
+        if self.current_highest_bid_id is None:
+            return None
+        bid = await info.context["bid_loader"].load(self.current_highest_bid_id)
+        return Bid.from_model(bid) if bid else None
+
+    @classmethod
+    def from_model(cls, auction: Any) -> "Auction":
+        return cls(
+            **_read_auction(auction),
+            starting_price=from_cents(auction.starting_price_cents),
+            reserve_price=from_cents(auction.reserve_price_cents),
+            current_price=from_cents(auction.current_price_cents),
+            min_bid_increment=from_cents(auction.min_bid_increment_cents),
+            status=_AUCTION_STATUS[auction.status],
+            bids=[Bid.from_model(bid) for bid in auction.bids],
+            auction_items=[AuctionItem.from_model(item) for item in auction.auction_items],
+        )
@@ -1,18 +1,33 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from db.database import init_database
+from core.redis import pubsub_pool, redis_pool
+from db.database import async_engine, engine, init_database
 from routers import story, job, redis
 from graphql_api.router import router as graphql_router
 
-# Initialize database
-init_database()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the database on startup and release pooled connections on shutdown."""
+    init_database()
+    yield
+    await async_engine.dispose()
+    engine.dispose()
+    await redis_pool.disconnect()
+    await pubsub_pool.disconnect()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Auction System",
     description="A secure, real-time auction system",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -4,12 +4,12 @@ Defines SQLAlchemy models for auctions, auction items, bids, and related entitie
 """
 
 from datetime import datetime, timedelta
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 from enum import Enum
-from typing import List, Optional
+from typing import Any, List, Optional
 from sqlalchemy import (
-    Boolean, Column, DateTime, Enum as SQLEnum, ForeignKey, Integer,
-    String, Text, Numeric, Index, CheckConstraint, UniqueConstraint
+    BigInteger, Boolean, Column, DateTime, ForeignKey, Integer,
+    String, Text, Index, CheckConstraint, UniqueConstraint, text
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Mapped, mapped_column
@@ -37,6 +37,45 @@ class BidStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+def to_cents(amount: Optional[Decimal]) -> Optional[int]:
+    """Convert a money amount to whole cents, rounding half-cents up."""
+    if amount is None:
+        return None
+    return int(amount.scaleb(2).to_integral_value(ROUND_HALF_UP))
+
+
+def from_cents(cents: Optional[int]) -> Optional[Decimal]:
+    """Convert whole cents back to a two-place money amount."""
+    if cents is None:
+        return None
+    return Decimal(cents).scaleb(-2)
+
+
+class Money:
+    """Expose an integer cents column as a Decimal amount.
+
+    Models store money as BigInteger cents; this descriptor lets Python code
+    keep reading and assigning ``Decimal`` amounts under the original name.
+    """
+
+    def __init__(self, cents_attr: str):
+        self.cents_attr = cents_attr
+
+    def __get__(self, obj: Any, owner: type) -> Any:
+        if obj is None:
+            return self
+        return from_cents(getattr(obj, self.cents_attr))
+
+    def __set__(self, obj: Any, value: Optional[Decimal]) -> None:
+        setattr(obj, self.cents_attr, to_cents(value))
+
+
+def status_check(status_enum: type[Enum], name: str) -> CheckConstraint:
+    """Restrict a plain string status column to the values of ``status_enum``."""
+    values = ", ".join(f"'{member.value}'" for member in status_enum)
+    return CheckConstraint(f"status IN ({values})", name=name)
+
+
 class Auction(Base):
     """Auction model representing an auction event that can contain multiple items."""
     __tablename__ = "auctions"
@@ -45,11 +84,15 @@ class Auction(Base):
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
 
-    # Pricing
-    starting_price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
-    reserve_price: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2))
-    current_price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
-    min_bid_increment: Mapped[Decimal] = mapped_column(Numeric(10, 2), default=1.00)
+    # Pricing, in cents
+    starting_price_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    reserve_price_cents: Mapped[Optional[int]] = mapped_column(BigInteger)
+    current_price_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    min_bid_increment_cents: Mapped[int] = mapped_column(BigInteger, default=100)
+    starting_price = Money("starting_price_cents")
+    reserve_price = Money("reserve_price_cents")
+    current_price = Money("current_price_cents")
+    min_bid_increment = Money("min_bid_increment_cents")
 
     # Timing
     start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -57,7 +100,7 @@ class Auction(Base):
     auto_extend_minutes: Mapped[int] = mapped_column(Integer, default=5)
 
     # Status and metadata
-    status: Mapped[AuctionStatus] = mapped_column(SQLEnum(AuctionStatus), default=AuctionStatus.DRAFT)
+    status: Mapped[str] = mapped_column(String(16), default=AuctionStatus.DRAFT.value)
     seller_id: Mapped[int] = mapped_column(Integer, nullable=False)  # Fake user ID
     category_id: Mapped[int] = mapped_column(Integer, nullable=False)
 
@@ -67,7 +110,7 @@ class Auction(Base):
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), onupdate=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     current_highest_bid: Mapped[Optional["Bid"]] = relationship("Bid", foreign_keys=[current_highest_bid_id])
@@ -76,17 +119,23 @@ class Auction(Base):
 
     # Constraints
     __table_args__ = (
-        CheckConstraint("starting_price >= 0", name="check_starting_price_positive"),
-        CheckConstraint("current_price >= 0", name="check_current_price_positive"),
-        CheckConstraint("min_bid_increment > 0", name="check_min_bid_increment_positive"),
+        CheckConstraint("starting_price_cents >= 0", name="check_starting_price_positive"),
+        CheckConstraint("current_price_cents >= 0", name="check_current_price_positive"),
+        CheckConstraint("min_bid_increment_cents > 0", name="check_min_bid_increment_positive"),
         CheckConstraint("end_time > start_time", name="check_end_time_after_start_time"),
+        status_check(AuctionStatus, "check_auction_status_valid"),
         Index("idx_auction_status_time", "status", "end_time"),
+        # Live listings only ever read active auctions by end time
+        Index("idx_auction_active_end", "end_time", postgresql_where=text("status = 'active'")),
         Index("idx_auction_seller", "seller_id"),
         Index("idx_auction_category", "category_id"),
         Index("idx_auction_winner", "winner_user_id"),
         Index("idx_auction_current_bid", "current_highest_bid_id"),
     )
 
+    # Fetch server-generated values (updated_at) with RETURNING on UPDATE too
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         return f"<Auction(id={self.id}, title='{self.title}', status='{self.status}')>"
 
@@ -110,7 +159,9 @@ class Auction(Base):
         """Calculate minimum bid amount."""
         if not self.bids:
             return self.starting_price
-        return max(self.current_price + self.min_bid_increment, self.current_price)
+        return from_cents(max(
+            self.current_price_cents + self.min_bid_increment_cents, self.current_price_cents
+        ))
 
 
 class AuctionItem(Base):
@@ -130,7 +181,7 @@ class AuctionItem(Base):
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), onupdate=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     auction: Mapped["Auction"] = relationship("Auction", back_populates="auction_items")
@@ -152,23 +203,29 @@ class Bid(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     auction_id: Mapped[int] = mapped_column(Integer, ForeignKey("auctions.id"), nullable=False)
     bidder_id: Mapped[int] = mapped_column(Integer, nullable=False)  # Fake user ID
-    amount: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
-    status: Mapped[BidStatus] = mapped_column(SQLEnum(BidStatus), default=BidStatus.PENDING)
+    amount_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    amount = Money("amount_cents")
+    status: Mapped[str] = mapped_column(String(16), default=BidStatus.PENDING.value)
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), onupdate=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     auction: Mapped["Auction"] = relationship("Auction", back_populates="bids", foreign_keys=[auction_id])
 
     # Constraints
     __table_args__ = (
-        CheckConstraint("amount > 0", name="check_bid_amount_positive"),
+        CheckConstraint("amount_cents > 0", name="check_bid_amount_positive"),
+        status_check(BidStatus, "check_bid_status_valid"),
         Index("idx_bid_auction_time", "auction_id", "created_at"),
         Index("idx_bid_bidder", "bidder_id"),
         Index("idx_bid_status", "status"),
-        Index("idx_bid_amount", "auction_id", "amount"),
+        # Highest bids per auction straight from the index, without heap fetches
+        Index(
+            "idx_bid_auction_amount_desc", "auction_id", text("amount_cents DESC"),
+            postgresql_include=["bidder_id", "status", "created_at"],
+        ),
     )
 
     def __repr__(self):
@@ -185,7 +242,7 @@ class Category(Base):
     slug: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), onupdate=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     def __repr__(self):
         return f"<Category(id={self.id}, name='{self.name}', slug='{self.slug}')>"
\ No newline at end of file
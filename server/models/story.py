@@ -1,7 +1,7 @@
 from db.database import Base
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON, Index, text
 
 
 class Story(Base):
@@ -12,7 +12,8 @@ class Story(Base):
     session_id = Column(String, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    nodes = relationship("StoryNode", back_populates="story")
+    # Never lazy-loaded: a query that needs the nodes eager-loads them
+    nodes = relationship("StoryNode", back_populates="story", lazy="raise")
 
 
 class StoryNode(Base):
@@ -20,9 +21,19 @@ class StoryNode(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     story_id = Column(Integer, ForeignKey("stories.id"), index=True)
-    content = Column(String)
+    # The generated narrative is the bulk of the row; only readers that show
+    # it load it, via undefer(), and touching it unloaded raises
+    content = deferred(Column(String), raiseload=True)
     is_ending = Column(Boolean, default=False)
     is_root = Column(Boolean, default=False)
     is_winning_ending = Column(Boolean, default=False)
     options = Column(JSON, default=list)
-    story = relationship("Story", back_populates="nodes")
\ No newline at end of file
+    story = relationship("Story", back_populates="nodes", lazy="raise")
+
+    __table_args__ = (
+        # Each story has a single root node; find it with one index seek
+        Index(
+            "ix_story_nodes_story_root", "story_id",
+            postgresql_where=text("is_root"), sqlite_where=text("is_root"),
+        ),
+    )
\ No newline at end of file
@@ -1,11 +1,15 @@
 import uuid
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends, HTTPException, Cookie, Response, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from redis.asyncio.client import PubSub
 
-from db.database import get_db
+from core.redis import close_pubsub, get_pubsub, job_channel
+from db.database import get_async_db, AsyncSessionLocal
 from models.job import StoryJob
-from schemas.job import StoryJobResponse
+from schemas.job import StoryJobResponse, StoryJobStatusEvent
 
 
 router = APIRouter(
@@ -13,11 +17,60 @@ router = APIRouter(
     tags=["jobs"]
 )
 
+# Proxies drop idle connections, so a quiet stream sends a comment this often
+HEARTBEAT_INTERVAL = 30
+TERMINAL_STATUSES = ("completed", "failed")
+
 
 @router.get("/{job_id}", response_model=StoryJobResponse)
-def get_job_status(job_id: str, db: Session = Depends(get_db)):
-    job = db.query(StoryJob).filter(StoryJob.job_id == job_id).first()
+async def get_job_status(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    job = await db.scalar(select(StoryJob).where(StoryJob.job_id == job_id))
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}/stream")
+async def stream_job_status(job_id: str):
+    """Stream the job's status transitions as server-sent events until it finishes."""
+    pubsub = get_pubsub()
+    try:
+        # Subscribe before reading the job, so no transition can slip in between
+        await pubsub.subscribe(job_channel(job_id))
+
+        # A short-lived session, so no database connection is held while streaming
+        async with AsyncSessionLocal() as db:
+            job = await db.scalar(select(StoryJob).where(StoryJob.job_id == job_id))
+    except BaseException:
+        await close_pubsub(pubsub)
+        raise
 
     if not job:
+        await close_pubsub(pubsub)
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
\ No newline at end of file
+
+    return StreamingResponse(
+        job_events(pubsub, StoryJobStatusEvent.model_validate(job)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def job_events(pubsub: PubSub, current: StoryJobStatusEvent) -> AsyncIterator[str]:
+    """Yield the job's current status, then each published transition up to a terminal one."""
+    try:
+        yield f"event: status\ndata: {current.model_dump_json()}\n\n"
+        status = current.status
+
+        while status not in TERMINAL_STATUSES:
+            message = await pubsub.get_message(timeout=HEARTBEAT_INTERVAL)
+            if message is None:
+                yield ": ping\n\n"
+                continue
+
+            data = message["data"]
+            status = StoryJobStatusEvent.model_validate_json(data).status
+            yield f"event: status\ndata: {data}\n\n"
+    finally:
+        await close_pubsub(pubsub)
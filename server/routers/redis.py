@@ -2,38 +2,36 @@
 Redis router for handling Redis operations.
 """
 
-import redis
-from fastapi import APIRouter, HTTPException
+import redis.asyncio as aioredis
+from fastapi import APIRouter, Depends, HTTPException
 from core.config import get_redis_url
+from core.redis import get_redis
 
 router = APIRouter()
 
 @router.get("/ping")
-async def ping_redis():
+async def ping_redis(r: aioredis.Redis = Depends(get_redis)):
     """Test Redis connectivity."""
     try:
-        r = redis.Redis.from_url(get_redis_url())
-        r.ping()
+        await r.ping()
         return {"status": "Redis is connected", "url": get_redis_url()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Redis connection failed: {str(e)}")
 
 @router.post("/set")
-async def set_redis_value(key: str, value: str):
+async def set_redis_value(key: str, value: str, r: aioredis.Redis = Depends(get_redis)):
     """Test Redis set operation."""
     try:
-        r = redis.Redis.from_url(get_redis_url())
-        r.set(key, value)
+        await r.set(key, value)
         return {"status": "success", "key": key, "value": value}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Redis set operation failed: {str(e)}")
 
 @router.get("/get/{key}")
-async def get_redis_value(key: str):
+async def get_redis_value(key: str, r: aioredis.Redis = Depends(get_redis)):
     """Test Redis get operation."""
     try:
-        r = redis.Redis.from_url(get_redis_url())
-        value = r.get(key)
-        return {"status": "success", "key": key, "value": value.decode() if value else None}
+        value = await r.get(key)
+        return {"status": "success", "key": key, "value": value}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Redis get operation failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Redis get operation failed: {str(e)}")
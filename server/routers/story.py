@@ -1,19 +1,28 @@
+import logging
 import uuid
-from typing import Optional
 from datetime import datetime
-from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, Cookie, Response, BackgroundTasks
+from typing import Optional
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+from fastapi import APIRouter, Depends, HTTPException, Cookie, Response
+from fastapi.concurrency import run_in_threadpool
 
 
 
-from db.database import get_db, SessionLocal
+from db.database import get_async_db
 from models.story import Story, StoryNode
 from models.job import StoryJob
 
 from schemas.job import StoryJobResponse
-from schemas.story import CompleteStoryResponse, CreateStoryRequest, CompleteStoryNodeResponse
+from schemas.story import CompleteStoryResponse, CreateStoryRequest, build_complete_story
 
-from core.story_generator import StoryGenerator
+from core.redis import STORY_CACHE_TTL, get_redis, story_cache_key
+from core.tasks import generate_story_task
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/story",
@@ -21,88 +30,87 @@ router = APIRouter(
 )
 
 
-def get_session_id(session_id: str = Cookie(None)):
-    if not session_id:
-        session_id = str(uuid.uuid4())
+def get_session_id(session_id: Optional[str] = Cookie(None)) -> Optional[str]:
+    # Anonymous callers get an id only once they create something
     return session_id
 
 
 @router.post("/create", response_model=StoryJobResponse)
-def create_story(
+async def create_story(
     request: CreateStoryRequest,
-    background_tasks: BackgroundTasks,
     response: Response,
-    session_id: str = Depends(get_session_id),
-    db: Session = Depends(get_db)
+    session_id: Optional[str] = Depends(get_session_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
+    if not session_id:
+        session_id = str(uuid.uuid4())
     response.set_cookie(key="session_id", value=session_id, httponly=True)
 
     job_id = str(uuid.uuid4())
-    job = StoryJob(
-        job_id=job_id,
-        session_id=session_id,
-        theme=request.theme,
-        status="pending",
+    # INSERT ... RETURNING hands back the server defaults, so no refresh SELECT
+    job = await db.scalar(
+        insert(StoryJob)
+        .values(
+            job_id=job_id,
+            session_id=session_id,
+            theme=request.theme,
+            status="pending",
+        )
+        .returning(StoryJob)
     )
+    await db.commit()
 
-    db.add(job)
-    db.commit()
-    db.refresh(job)
-
-    background_tasks.add_task(
-        generate_story_task,
-        job_id,
-        request.theme,
-        session_id
-    )
+    # Generation runs on a Celery worker; the job row tracks its progress.
+    # Publishing to the broker blocks (and retries), so it runs off the loop
+    try:
+        await run_in_threadpool(generate_story_task.delay, job_id, request.theme, session_id)
+    except Exception as e:
+        logger.error("Queueing story generation for job %s failed: %s", job_id, e)
+        # Nothing will ever pick the job up, so don't leave it pending
+        job.status = "failed"
+        job.error = "Could not queue story generation"
+        job.completed_at = datetime.now()
+        await db.commit()
+        raise HTTPException(status_code=503, detail="Story generation is unavailable")
 
     return job
 
-def generate_story_task(job_id: str, theme: str, session_id: str):
-    db = SessionLocal()
 
+@router.get("/{story_id}/complete", response_model=CompleteStoryResponse)
+async def get_complete_story(
+    story_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    r: aioredis.Redis = Depends(get_redis),
+):
+    # Stories are immutable once generated, so a cached body is always current
+    key = story_cache_key(story_id)
     try:
-        job = db.query(StoryJob).filter(StoryJob.job_id == job_id).first()
-
-        if not job:
-            return
-
-        try:
-            job.status = "processing"
-            db.commit()
-
-            story = StoryGenerator.generate_story(db, session_id, theme)
-
-            job.story_id = story.id
-            job.status = "completed"
-            job.completed_at = datetime.now()
-            db.commit()
-
-        except Exception as e:
-            job.error = str(e)
-            job.status = "failed"
-            job.completed_at = datetime.now()
-            db.commit()
-            raise e
-    finally:
-        db.close()
-
-
-
-@router.get("/{story_id}/complete", response_model=StoryJobResponse)
-def get_complete_story(story_id: int, db: Session = Depends(get_db)):
-    story = db.query(Story).filter(Story.id == story_id).first()
+        cached = await r.get(key)
+    except RedisError as e:
+        logger.warning("Story cache read failed for story %s: %s", story_id, e)
+        cached = None
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # All nodes arrive in one extra SELECT; any other lazy load raises
+    story = await db.scalar(
+        select(Story)
+        .options(selectinload(Story.nodes).undefer(StoryNode.content), raiseload("*"))
+        .where(Story.id == story_id)
+    )
 
     if not story:
         raise HTTPException(status_code=404, detail="Story not found")
 
+    complete_story = build_complete_story(story)
+    if complete_story is None:
+        raise HTTPException(status_code=404, detail="Story has no root node")
 
-    complete_story = build_complete_story(story_id, db)
-
-    return complete_story
-
-
-def build_complete_story(story_id: int, db: Session = Depends(get_db)):
-    pass
-
+    # Serialize once, for both the cache and the response
+    body = complete_story.model_dump_json()
+    try:
+        await r.set(key, body, ex=STORY_CACHE_TTL)
+    except RedisError as e:
+        logger.warning("Story cache write failed for story %s: %s", story_id, e)
 
+    return Response(content=body, media_type="application/json")
@@ -1,22 +1,96 @@
-import redis
 import asyncio
+import logging
+from typing import Dict, Set
+
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 
+from core.redis import close_pubsub, get_pubsub
+
+logger = logging.getLogger(__name__)
+
 app = FastAPI()
-redis_client = redis.Redis(host='localhost', port=6379, db=0)
+
+# Bids buffered per connection before its oldest undelivered ones are dropped
+SEND_QUEUE_SIZE = 100
+# Pause before resubscribing after the Redis subscription fails
+RESUBSCRIBE_DELAY = 1.0
+
+
+class AuctionHub:
+    """Fans each auction's bids out to all of its websockets from one Redis subscription."""
+
+    def __init__(self) -> None:
+        self.channels: Dict[int, Set[asyncio.Queue]] = {}
+        self.tasks: Dict[int, asyncio.Task] = {}
+
+    def connect(self, auction_id: int) -> asyncio.Queue:
+        """Register a watcher, returning the queue its bids are delivered to."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.channels.setdefault(auction_id, set()).add(queue)
+        if auction_id not in self.tasks:
+            self.tasks[auction_id] = asyncio.create_task(self._pump(auction_id))
+        return queue
+
+    def disconnect(self, auction_id: int, queue: asyncio.Queue) -> None:
+        queues = self.channels.get(auction_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            # Last watcher gone: drop the subscription along with the channel
+            del self.channels[auction_id]
+            self.tasks.pop(auction_id).cancel()
+
+    async def _pump(self, auction_id: int) -> None:
+        # Runs until the last watcher leaves; a failed subscription is logged
+        # and re-established instead of leaving the watchers silently deaf
+        while True:
+            try:
+                await self._forward(auction_id)
+            except Exception:
+                logger.exception("Bid subscription for auction %s failed; resubscribing", auction_id)
+                await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+    async def _forward(self, auction_id: int) -> None:
+        pubsub = get_pubsub()
+        try:
+            await pubsub.subscribe(f"auction_{auction_id}_bids")
+            # Wakes as soon as Redis pushes a message; nothing polls or sleeps
+            async for message in pubsub.listen():
+                # Only enqueues, so a slow socket never holds up the others;
+                # one that falls a full queue behind loses its oldest bids
+                for queue in self.channels.get(auction_id, ()):
+                    if queue.full():
+                        queue.get_nowait()
+                    queue.put_nowait(message["data"])
+        finally:
+            await close_pubsub(pubsub)
+
+
+hub = AuctionHub()
+
+
+async def send_bids(websocket: WebSocket, queue: asyncio.Queue) -> None:
+    """Deliver a watcher's queued bids at whatever pace its socket allows."""
+    try:
+        while True:
+            await websocket.send_text(await queue.get())
+    except Exception:
+        # The socket is gone; the receive loop sees the disconnect and cleans up
+        pass
+
 
 @app.websocket("/ws/auctions/{auction_id}")
 async def auction_ws(websocket: WebSocket, auction_id: int):
     await websocket.accept()
-    pubsub = redis_client.pubsub()
-    pubsub.subscribe(f"auction_{auction_id}_bids")
-
+    queue = hub.connect(auction_id)
+    sender = asyncio.create_task(send_bids(websocket, queue))
     try:
+        # A quiet channel never touches the socket, so watch it for the disconnect
         while True:
-            message = pubsub.get_message(ignore_subscribe_messages=True, timeout=1)
-            if message:
-                await websocket.send_text(message['data'].decode())
-            await asyncio.sleep(0.1)
+            await websocket.receive_text()
     except WebSocketDisconnect:
-        pubsub.unsubscribe()
-        return
\ No newline at end of file
+        pass
+    finally:
+        sender.cancel()
+        hub.disconnect(auction_id, queue)
@@ -1,6 +1,6 @@
 from typing import Optional
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class StoryJobBase(BaseModel):
@@ -17,5 +17,12 @@ class StoryJobResponse(StoryJobBase):
     story_id: Optional[int] = None
     error: Optional[str] = None
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+class StoryJobStatusEvent(BaseModel):
+    job_id: str
+    status: str
+    story_id: Optional[int] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
@@ -1,10 +1,13 @@
 from datetime import datetime
-from pydantic import BaseModel
-from typing import List, Optional, Dict
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import Any, List, Optional, Dict
 
 class StoryOptionsSchema(BaseModel):
     text: str
-    node_id: Optional[int] = None
+    # Stored options link to their target as next_node_id
+    node_id: Optional[int] = Field(
+        default=None, validation_alias=AliasChoices("node_id", "next_node_id")
+    )
 
 
 class StoryNodeBase(BaseModel):
@@ -16,15 +19,21 @@ class CompleteStoryNodeResponse(StoryNodeBase):
     id: int
     options: List[StoryOptionsSchema]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", populate_by_name=True)
+
+    @field_validator("options", mode="before")
+    @classmethod
+    def text_only_options(cls, options: Any) -> Any:
+        # Plain strings are options without a target node
+        if options is None:
+            return []
+        return [{"text": option} if isinstance(option, str) else option for option in options]
 
 class StoryBase(BaseModel):
     title: str
     session_id: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", populate_by_name=True)
 
 class CreateStoryRequest(BaseModel):
     theme: str
@@ -36,5 +45,28 @@ class CompleteStoryResponse(BaseModel):
     root_node: CompleteStoryNodeResponse
     all_nodes: List[CompleteStoryNodeResponse]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", populate_by_name=True)
+
+
+# Built once: validating a story's nodes reuses the compiled list schema
+STORY_NODES_ADAPTER = TypeAdapter(List[CompleteStoryNodeResponse])
+
+
+def build_complete_story(story: Any) -> Optional[CompleteStoryResponse]:
+    """Assemble the full story response from a story with its nodes loaded.
+
+    Returns None when the story has no root node.
+    """
+    all_nodes = STORY_NODES_ADAPTER.validate_python(story.nodes, from_attributes=True)
+    root_node = next(
+        (response for node, response in zip(story.nodes, all_nodes) if node.is_root), None
+    )
+    if root_node is None:
+        return None
+
+    return CompleteStoryResponse(
+        id=story.id,
+        created_at=story.created_at,
+        root_node=root_node,
+        all_nodes=all_nodes,
+    )